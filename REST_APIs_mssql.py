@@ -1,85 +1,543 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, request, jsonify, render_template, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_sqlalchemy import SQLAlchemy
+import atexit
+import base64
+import decimal
+import orjson
 import os
+import pickle
+import threading
+import time
 from dotenv import load_dotenv
-from sqlalchemy import update, MetaData, Table, inspect
-import urllib.parse
+from sqlalchemy import func, literal_column, select, text, update, bindparam, MetaData, Table, inspect
+from sqlalchemy.dialects import mssql
+from sqlalchemy.engine import URL
 
 # Initialize SQLAlchemy instance
 db = SQLAlchemy()
 
+# Buffered inserts are flushed every INSERT_FLUSH_INTERVAL seconds or once a table has INSERT_FLUSH_ROWS rows queued
+INSERT_FLUSH_INTERVAL = 0.05
+INSERT_FLUSH_ROWS = 500
+
+TABLE_SCHEMA_QUERY = text(
+    "SELECT TABLE_SCHEMA, TABLE_NAME FROM INFORMATION_SCHEMA.TABLES "
+    "WHERE TABLE_TYPE = 'BASE TABLE' ORDER BY TABLE_SCHEMA"
+)
+
+# Each worker re-runs SCHEMA_VERSION_QUERY at most every SCHEMA_CHECK_INTERVAL seconds and reloads on a change
+SCHEMA_CHECK_INTERVAL = 30
+
+# Changes whenever a table is created, dropped, renamed or altered
+SCHEMA_VERSION_QUERY = text(
+    "SELECT CHECKSUM_AGG(CHECKSUM(object_id, schema_id, name, modify_date)) FROM sys.tables"
+)
+
+def _orjson_default(obj):
+    # orjson has no native Decimal support; keep Flask's behaviour of sending it as a string
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    # varbinary/image/rowversion values are sent as base64-encoded strings
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return base64.b64encode(obj).decode('ascii')
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class ORJSONProvider(JSONProvider):
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 class FlaskApp:
     def __init__(self):
         self.app = Flask(__name__)
+        self.app.json = ORJSONProvider(self.app)
         self._load_config()
         self._setup_database()
         self._setup_routes()
 
     def _load_config(self):
         load_dotenv()  # Load environment variables from .env file
-        self.app.config['SQLALCHEMY_DATABASE_URI'] = f"mssql+pyodbc://{os.getenv('DB_USER')}:{urllib.parse.quote_plus(os.getenv('DB_PASSWORD'))}@{os.getenv('DB_SERVER')}/{os.getenv('DB_DATABASE')}?driver=ODBC+Driver+17+for+SQL+Server"
+        # URL.create escapes the credentials itself, so the password no longer needs quote_plus
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = URL.create(
+            'mssql+pyodbc',
+            username=os.getenv('DB_USER'),
+            password=os.getenv('DB_PASSWORD'),
+            host=os.getenv('DB_SERVER'),
+            database=os.getenv('DB_DATABASE'),
+            query={'driver': os.getenv('DB_DRIVER', 'ODBC Driver 17 for SQL Server')},
+        )
         self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        self.app.config['SCHEMA_CACHE_PATH'] = os.getenv('SCHEMA_CACHE_PATH', '.schema_cache.pkl')
+        self.app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'pool_size': 20,
+            'max_overflow': 10,
+            'pool_timeout': 30,
+            'pool_recycle': 1800,
+            'pool_pre_ping': True,
+            'pool_use_lifo': True,
+            'fast_executemany': True,
+        }
 
     def _setup_database(self):
         global db
         db.init_app(self.app)
+        self._schema_lock = threading.Lock()
+        self._table_lock = threading.Lock()
+        self._schema_check_lock = threading.Lock()
+        self._schema_checked_at = time.monotonic()
+        self._insert_buffer_lock = threading.Lock()
+        self._insert_buffers = {}
+        self._insert_flush_event = threading.Event()
+        self._insert_flusher = None
         with self.app.app_context():
-            self.metadata = MetaData()
-            self.metadata.reflect(bind=db.engine)
+            self.inspector = inspect(db.engine)
+            self._reflect_schema(use_cache=True)
+
+    def _schema_cache_key(self, version):
+        # Default-schema tables are pickled without a schema prefix, so a cache is only valid
+        # for the same server, database and login (default schema) it was written from
+        return {
+            'url': db.engine.url.render_as_string(hide_password=True),
+            'default_schema': self.inspector.default_schema_name,
+            'version': version,
+        }
+
+    def _load_schema_cache(self, version):
+        try:
+            with open(self.app.config['SCHEMA_CACHE_PATH'], 'rb') as f:
+                cached = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error loading schema cache: {e}")
+            return None
+        if cached.get('key') != self._schema_cache_key(version):
+            return None
+        return cached['metadata']
+
+    def _save_schema_cache(self, version, metadata):
+        path = self.app.config['SCHEMA_CACHE_PATH']
+        try:
+            # Write to a temporary file first so other workers never read a partial cache
+            with open(f"{path}.{os.getpid()}.tmp", 'wb') as f:
+                pickle.dump({'key': self._schema_cache_key(version), 'metadata': metadata}, f)
+            os.replace(f"{path}.{os.getpid()}.tmp", path)
+        except Exception as e:
+            print(f"Error saving schema cache: {e}")
+
+    def _reflect_schema(self, use_cache=False):
+        with db.engine.connect() as conn:
+            version = conn.execute(SCHEMA_VERSION_QUERY).scalar()
+        metadata = self._load_schema_cache(version) if use_cache else None
+        if metadata is None:
+            metadata = MetaData()
+            metadata.reflect(bind=db.engine)
+            self._save_schema_cache(version, metadata)
+        default_schema = self.inspector.default_schema_name
+        pk_map = {}
+        version_columns = {}
+        for table in metadata.tables.values():
+            schema_name = table.schema or default_schema
+            if table.primary_key.columns:
+                pk_map[(schema_name, table.name)] = next(iter(table.primary_key.columns)).name
+            version_columns[(schema_name, table.name)] = self._find_version_column(table)
+        with self._table_lock:
+            self.metadata = metadata
+            self._default_schema = default_schema
+            self._table_cache = {}
+            self._pk_map = pk_map
+            self._schema_version = version
+            self._version_columns = version_columns
+            self._statement_cache = {}
+        self._refresh_table_schema_map()
+
+    def _check_schema_version(self):
+        # /refresh_schema only reaches the worker that served it; other workers notice the
+        # change here and reload, from the disk cache that worker has just rewritten
+        if time.monotonic() - self._schema_checked_at < SCHEMA_CHECK_INTERVAL:
+            return
+        if not self._schema_check_lock.acquire(blocking=False):
+            return
+        try:
+            self._schema_checked_at = time.monotonic()
+            with db.engine.connect() as conn:
+                version = conn.execute(SCHEMA_VERSION_QUERY).scalar()
+            if version != self._schema_version:
+                self._reflect_schema(use_cache=True)
+        except Exception as e:
+            print(f"Error checking schema version: {e}")
+        finally:
+            self._schema_check_lock.release()
+
+    def _refresh_table_schema_map(self):
+        # Build the table -> schema lookup once instead of scanning every schema per request,
+        # reading the whole catalog in one query rather than one get_table_names() per schema
+        table_schema_map = {}
+        with db.engine.connect() as conn:
+            for schema, table in conn.execute(TABLE_SCHEMA_QUERY):
+                table_schema_map.setdefault(table, schema)
+        with self._schema_lock:
+            self._table_schema_map = table_schema_map
 
     def fetch_schema_name(self, table_name):
+        schema_name = self._table_schema_map.get(table_name)
+        if schema_name:
+            return schema_name
         try:
-            inspector = inspect(db.engine)
-            for schema in inspector.get_schema_names():
-                for table in inspector.get_table_names(schema=schema):
-                    if table == table_name:
-                        return schema
-            return None
+            # Table may have been created since startup, re-scan the catalog once
+            self._refresh_table_schema_map()
+            return self._table_schema_map.get(table_name)
         except Exception as e:
             print(f"Error fetching schema name: {e}")
             return None
 
+    def _get_table(self, schema_name, table_name):
+        key = (schema_name, table_name)
+        table = self._table_cache.get(key)
+        if table is not None:
+            return table
+        with self._table_lock:
+            table = self._table_cache.get(key)
+            if table is None:
+                # Tables of the default schema were reflected at startup without a schema prefix
+                if schema_name == self._default_schema:
+                    table = self.metadata.tables.get(table_name)
+                if table is None:
+                    table = Table(table_name, self.metadata, schema=schema_name, autoload_with=db.engine)
+                self._table_cache[key] = table
+            return table
+
+    def _get_pk_column(self, schema_name, table_name, table):
+        try:
+            return table.c[self._pk_map[(schema_name, table_name)]]
+        except KeyError:
+            pk_column = [col for col in table.primary_key][0]
+            self._pk_map[(schema_name, table_name)] = pk_column.name
+            return pk_column
+
+    @staticmethod
+    def _find_version_column(table):
+        # SQL Server bumps a rowversion column on every insert and update of the row
+        return next((col.name for col in table.c if isinstance(col.type, mssql.TIMESTAMP)), None)
+
+    def _get_version_column(self, schema_name, table_name, table):
+        try:
+            column_name = self._version_columns[(schema_name, table_name)]
+        except KeyError:
+            column_name = self._find_version_column(table)
+            self._version_columns[(schema_name, table_name)] = column_name
+        return table.c[column_name] if column_name else None
+
+    def _get_statement(self, schema_name, table_name, operation):
+        # Statements take their values as execute() parameters, so one object per table
+        # and operation can be reused and hits SQLAlchemy's compiled cache every time
+        key = (schema_name, table_name, operation)
+        statement = self._statement_cache.get(key)
+        if statement is None:
+            table = self._get_table(schema_name, table_name)
+            if operation == 'insert':
+                statement = table.insert()
+            elif operation == 'version':
+                version_column = self._get_version_column(schema_name, table_name, table)
+                if version_column is not None:
+                    # Updates and inserts raise MAX(rowversion), deletes lower the count
+                    statement = select(func.count(), func.max(version_column)).select_from(table)
+                elif any(isinstance(col.type, (mssql.TEXT, mssql.NTEXT, mssql.IMAGE, mssql.XML)) for col in table.c):
+                    # BINARY_CHECKSUM skips these types, so edits to them would not change the token
+                    return None
+                else:
+                    # Fallback without a rowversion column: a full scan, and CHECKSUM_AGG can collide,
+                    # so an unchanged token is likely but not guaranteed to mean unchanged data
+                    statement = select(func.count(), func.checksum_agg(func.binary_checksum(literal_column('*')))).select_from(table)
+            else:
+                pk_column = self._get_pk_column(schema_name, table_name, table)
+                if operation == 'exists':
+                    statement = select(pk_column).where(pk_column == bindparam('_pk_value'))
+                elif operation == 'update':
+                    statement = update(table).where(pk_column == bindparam('_pk_value'))
+                else:
+                    statement = table.delete().where(pk_column == bindparam('_pk_value'))
+            self._statement_cache[key] = statement
+        return statement
+
+    def _check_columns(self, schema_name, table_name, rows):
+        # Parameters that don't match a column are silently dropped by execute(), report them instead
+        columns = self._get_table(schema_name, table_name).c
+        rows = rows if isinstance(rows, list) else [rows]
+        if not all(isinstance(row, dict) for row in rows):
+            raise ValueError("Each record must be a JSON object.")
+        for row in rows:
+            unknown = [key for key in row if key not in columns]
+            if unknown:
+                raise ValueError(f"Unconsumed column names: {', '.join(unknown)}")
+        # executemany builds a single INSERT from the first row's keys, so every row must use the same columns
+        if any(row.keys() != rows[0].keys() for row in rows):
+            raise ValueError("All records must provide the same columns.")
+
+    def fetch_table_version(self, schema_name, table_name):
+        try:
+            version_query = self._get_statement(schema_name, table_name, 'version')
+            if version_query is None:
+                return None
+            with db.engine.connect() as conn:
+                row_count, version = conn.execute(version_query).one()
+            if isinstance(version, bytes):
+                version = version.hex()
+            # Include the schema version so that e.g. an added column invalidates cached responses
+            return f"{self._schema_version}-{row_count}-{version}"
+        except Exception as e:
+            print(f"Error fetching table version: {e}")
+            return None
+
     def read_data_from_mssql(self, schema_name, table_name):
+        conn = None
         try:
-            table = Table(table_name, self.metadata, schema=schema_name, autoload_with=db.engine)
-            result = db.session.execute(table.select()).fetchall()
-            return [dict(row._mapping) for row in result]
+            table = self._get_table(schema_name, table_name)
+            query = table.select().execution_options(stream_results=True, yield_per=1000)
+            # Plain Core connection, held open until the last row has been streamed
+            conn = db.engine.connect()
+            result = conn.execute(query)
+            # Reflected names are quoted_name, a str subclass that orjson rejects as a dict key
+            columns = tuple(str(key) for key in result.keys())
+            # Fetch and encode the first row before anything is sent, so query and
+            # serialization errors can still be answered with a 500
+            first_row = result.fetchone()
+            first_chunk = b'['
+            if first_row is not None:
+                first_chunk += orjson.dumps(dict(zip(columns, first_row)), default=_orjson_default)
         except Exception as e:
+            if conn is not None:
+                conn.close()
             return {"error": str(e)}
 
+        def generate():
+            # Emit the JSON array row by row instead of materializing the whole result set
+            try:
+                yield first_chunk
+                for row in result:
+                    # Reuse one key tuple for every row rather than building a RowMapping per row
+                    yield b',' + orjson.dumps(dict(zip(columns, row)), default=_orjson_default)
+                yield b']'
+            except Exception as e:
+                # The 200 status is already sent, so the client only sees a truncated body
+                print(f"Error streaming {schema_name}.{table_name}, response truncated: {e}")
+                raise
+            finally:
+                conn.close()
+
+        return generate()
+
+    def _insert_records(self, conn, schema_name, table_name, table_data):
+        # Callers validate table_data with _check_columns first
+        insert_query = self._get_statement(schema_name, table_name, 'insert')
+        # A list of rows goes out as a single executemany round-trip
+        conn.execute(insert_query, table_data)
+
     def add_record_to_table(self, schema_name, table_name, table_data):
         try:
-            table = Table(table_name, self.metadata, schema=schema_name, autoload_with=db.engine)
-            insert_query = table.insert().values(**table_data)
-            db.session.execute(insert_query)
-            db.session.commit()
+            with db.engine.begin() as conn:
+                self._insert_records(conn, schema_name, table_name, table_data)
+            if isinstance(table_data, list):
+                return {"message": f"{len(table_data)} records added successfully"}
             return {"message": "Record added successfully"}
         except Exception as e:
             return {"error": str(e)}
 
+    def buffer_records_for_table(self, schema_name, table_name, table_data):
+        rows = table_data if isinstance(table_data, list) else [table_data]
+        # Rows are only batched with rows that have the same columns, since one executemany
+        # builds its INSERT from the first row's keys
+        key = (schema_name, table_name, frozenset(rows[0]))
+        with self._insert_buffer_lock:
+            buffer = self._insert_buffers.setdefault(key, [])
+            buffer.extend(rows)
+            if len(buffer) >= INSERT_FLUSH_ROWS:
+                self._insert_flush_event.set()
+            if self._insert_flusher is None:
+                self._insert_flusher = threading.Thread(target=self._run_insert_flusher, daemon=True)
+                self._insert_flusher.start()
+                atexit.register(self._flush_insert_buffers)
+        return {"message": f"{len(rows)} records queued for insert"}
+
+    def _run_insert_flusher(self):
+        while True:
+            self._insert_flush_event.wait(INSERT_FLUSH_INTERVAL)
+            self._insert_flush_event.clear()
+            self._flush_insert_buffers()
+
+    def _flush_insert_buffers(self):
+        # Swap the buffers out under the lock so request threads never wait on the database
+        with self._insert_buffer_lock:
+            buffers, self._insert_buffers = self._insert_buffers, {}
+        if not buffers:
+            return
+        with self.app.app_context():
+            for (schema_name, table_name, _), rows in buffers.items():
+                try:
+                    insert_query = self._get_statement(schema_name, table_name, 'insert')
+                    with db.engine.begin() as conn:
+                        conn.execute(insert_query, rows)
+                except Exception as e:
+                    print(f"Error flushing buffered records for {schema_name}.{table_name}, retrying row by row: {e}")
+                    self._flush_rows_individually(schema_name, table_name, rows)
+
+    def _flush_rows_individually(self, schema_name, table_name, rows):
+        # These rows were already acknowledged with 202, so a bad row must only cost itself
+        for row in rows:
+            try:
+                insert_query = self._get_statement(schema_name, table_name, 'insert')
+                with db.engine.begin() as conn:
+                    conn.execute(insert_query, row)
+            except Exception as e:
+                print(f"Error inserting buffered record into {schema_name}.{table_name}: {e} ({row})")
+
+    def _record_exists(self, conn, schema_name, table_name, pk):
+        exists_query = self._get_statement(schema_name, table_name, 'exists')
+        return conn.execute(exists_query, {'_pk_value': pk}).first() is not None
+
+    def _check_update_data(self, schema_name, table_name, update_data):
+        if not isinstance(update_data, dict):
+            raise ValueError("Update data must be a JSON object.")
+        self._check_columns(schema_name, table_name, update_data)
+
+    def _update_record(self, conn, schema_name, table_name, pk, update_data):
+        # Callers validate update_data with _check_update_data first
+        # Skip the write (and its locks/log records) when the key doesn't exist
+        if not self._record_exists(conn, schema_name, table_name, pk):
+            return False
+        update_query = self._get_statement(schema_name, table_name, 'update')
+        # The existence check takes no lock, so the row may have been deleted in between
+        return conn.execute(update_query, {**update_data, '_pk_value': pk}).rowcount > 0
+
+    def _delete_record(self, conn, schema_name, table_name, pk):
+        if not self._record_exists(conn, schema_name, table_name, pk):
+            return False
+        delete_query = self._get_statement(schema_name, table_name, 'delete')
+        return conn.execute(delete_query, {'_pk_value': pk}).rowcount > 0
+
     def update_record_in_table(self, schema_name, table_name, pk, update_data):
         try:
-            table = Table(table_name, self.metadata, schema=schema_name, autoload_with=db.engine)
-            pk_column = [col for col in table.primary_key][0]
-            update_query = update(table).where(pk_column == pk).values(**update_data)
-            db.session.execute(update_query)
-            db.session.commit()
+            with db.engine.begin() as conn:
+                if not self._update_record(conn, schema_name, table_name, pk, update_data):
+                    return None
             return {"message": "Record updated successfully"}
         except Exception as e:
             return {"error": str(e)}
 
     def delete_record_from_table(self, schema_name, table_name, pk):
         try:
-            table = Table(table_name, self.metadata, schema=schema_name, autoload_with=db.engine)
-            pk_column = [col for col in table.primary_key][0]
-            delete_query = table.delete().where(pk_column == pk)
-            db.session.execute(delete_query)
-            db.session.commit()
+            with db.engine.begin() as conn:
+                if not self._delete_record(conn, schema_name, table_name, pk):
+                    return None
             return {"message": "Record deleted successfully"}
         except Exception as e:
             return {"error": str(e)}
 
+    def _apply_batch_operation(self, conn, operation):
+        if not isinstance(operation, dict):
+            raise ValueError("Each operation must be a JSON object.")
+
+        action = operation.get('op')
+        table_name = operation.get('table_name')
+        pk = operation.get('pk')
+
+        if action not in ('add', 'update', 'delete'):
+            raise ValueError(f"Unknown operation '{action}', expected 'add', 'update' or 'delete'.")
+        if not table_name:
+            raise ValueError("Table name is not provided.")
+
+        schema_name = self.fetch_schema_name(table_name)
+
+        if not schema_name:
+            raise LookupError(f"Schema for table '{table_name}' not found.")
+
+        if action == 'add':
+            table_data = operation.get('table_data')
+            if not table_data:
+                raise ValueError("Table data is not provided.")
+            self._check_columns(schema_name, table_name, table_data)
+            self._insert_records(conn, schema_name, table_name, table_data)
+            return {"message": "Record added successfully"}
+
+        if not pk:
+            raise ValueError("Primary key (pk) is not provided.")
+
+        if action == 'update':
+            update_data = operation.get('update_data')
+            if not update_data:
+                raise ValueError("Update data is not provided.")
+            self._check_update_data(schema_name, table_name, update_data)
+            found = self._update_record(conn, schema_name, table_name, pk, update_data)
+        else:
+            found = self._delete_record(conn, schema_name, table_name, pk)
+
+        if not found:
+            raise LookupError(f"Record with primary key '{pk}' not found in table '{table_name}'.")
+
+        return {"message": f"Record {action}d successfully"}
+
+    @staticmethod
+    def _merge_batch_inserts(operations):
+        # Fold consecutive 'add' operations on the same table and columns into one operation,
+        # so the whole run is sent as a single fast_executemany insert
+        groups = []
+        for index, operation in enumerate(operations):
+            rows = None
+            if isinstance(operation, dict) and operation.get('op') == 'add':
+                rows = operation.get('table_data')
+                rows = rows if isinstance(rows, list) else [rows]
+                # Empty or malformed payloads stay separate so they fail validation on their own
+                if not rows or not all(isinstance(row, dict) and row for row in rows):
+                    rows = None
+            if groups and rows is not None:
+                indices, previous, columns = groups[-1]
+                if (columns is not None and previous['table_name'] == operation.get('table_name')
+                        and all(row.keys() == columns for row in rows)):
+                    previous['table_data'].extend(rows)
+                    indices.append(index)
+                    continue
+            if rows is not None and all(row.keys() == rows[0].keys() for row in rows):
+                merged = {'op': 'add', 'table_name': operation.get('table_name'), 'table_data': list(rows)}
+                groups.append(([index], merged, rows[0].keys()))
+            else:
+                groups.append(([index], operation, None))
+        return groups
+
+    def run_batch(self, operations, atomic=True):
+        # All operations share one transaction and one commit; in non-atomic mode each
+        # operation runs in its own savepoint so a failure only undoes that operation
+        results = []
+        index = 0
+        try:
+            with db.engine.begin() as conn:
+                if atomic:
+                    for indices, operation, _ in self._merge_batch_inserts(operations):
+                        index = indices[0]
+                        result = self._apply_batch_operation(conn, operation)
+                        results.extend(result for _ in indices)
+                else:
+                    for index, operation in enumerate(operations):
+                        try:
+                            with conn.begin_nested():
+                                results.append(self._apply_batch_operation(conn, operation))
+                        except Exception as e:
+                            results.append({"error": str(e)})
+        except ValueError as e:
+            return {"error": f"Operation {index} failed, batch rolled back: {e}", "operation": index}, 400
+        except LookupError as e:
+            return {"error": f"Operation {index} failed, batch rolled back: {e}", "operation": index}, 404
+        except Exception as e:
+            return {"error": f"Operation {index} failed, batch rolled back: {e}", "operation": index}, 500
+        return {"results": results}, 200
+
     def _setup_routes(self):
+        @self.app.before_request
+        def check_schema_version():
+            self._check_schema_version()
+
         @self.app.route('/')
         def index():
             return render_template('index.html')
@@ -97,12 +555,22 @@ class FlaskApp:
             if not schema_name:
                 return jsonify({"error": f"Schema for table '{table_name}' not found."}), 404
 
+            version = self.fetch_table_version(schema_name, table_name)
+
+            if version and request.if_none_match.contains_weak(version):
+                response = Response(status=304)
+                response.set_etag(version)
+                return response
+
             final_status = self.read_data_from_mssql(schema_name, table_name)
 
-            if "error" in final_status:
+            if isinstance(final_status, dict):
                 return jsonify(final_status), 500
 
-            return jsonify(final_status)
+            response = Response(stream_with_context(final_status), mimetype='application/json')
+            if version:
+                response.set_etag(version)
+            return response
 
         @self.app.route('/add_record', methods=['POST'])
         def add_record():
@@ -118,6 +586,17 @@ class FlaskApp:
             if not schema_name:
                 return jsonify({"error": f"Schema for table '{table_name}' not found."}), 404
 
+            try:
+                self._check_columns(schema_name, table_name, table_data)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            except Exception as e:
+                return jsonify({"error": str(e)}), 500
+
+            if request.args.get('buffered') == 'true':
+                final_status = self.buffer_records_for_table(schema_name, table_name, table_data)
+                return jsonify(final_status), 202
+
             final_status = self.add_record_to_table(schema_name, table_name, table_data)
 
             if "error" in final_status:
@@ -140,8 +619,18 @@ class FlaskApp:
             if not schema_name:
                 return jsonify({"error": f"Schema for table '{table_name}' not found."}), 404
 
+            try:
+                self._check_update_data(schema_name, table_name, update_data)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            except Exception as e:
+                return jsonify({"error": str(e)}), 500
+
             final_status = self.update_record_in_table(schema_name, table_name, pk, update_data)
 
+            if final_status is None:
+                return jsonify({"error": f"Record with primary key '{pk}' not found in table '{table_name}'."}), 404
+
             if "error" in final_status:
                 return jsonify(final_status), 500
 
@@ -163,11 +652,41 @@ class FlaskApp:
 
             final_status = self.delete_record_from_table(schema_name, table_name, pk)
 
+            if final_status is None:
+                return jsonify({"error": f"Record with primary key '{pk}' not found in table '{table_name}'."}), 404
+
             if "error" in final_status:
                 return jsonify(final_status), 500
 
             return jsonify(final_status)
 
+        @self.app.route('/batch', methods=['POST'])
+        def batch():
+            request_data = request.get_json()
+            operations = request_data.get('ops')
+            atomic = request_data.get('atomic', True)
+
+            if not operations or not isinstance(operations, list):
+                return jsonify({"error": "List of operations (ops) is not provided."}), 400
+
+            if not isinstance(atomic, bool):
+                return jsonify({"error": "atomic must be true or false."}), 400
+
+            final_status, status_code = self.run_batch(operations, atomic)
+
+            return jsonify(final_status), status_code
+
+        # Other workers pick up a change within SCHEMA_CHECK_INTERVAL, but only if it altered
+        # SCHEMA_VERSION_QUERY (e.g. not index-only changes); those need a restart of every worker
+        @self.app.route('/refresh_schema', methods=['POST'])
+        def refresh_schema():
+            try:
+                self._reflect_schema()
+            except Exception as e:
+                return jsonify({"error": str(e)}), 500
+
+            return jsonify({"message": "Schema refreshed successfully"})
+
     def run(self):
         self.app.run()
 
@@ -0,0 +1,119 @@
+import sqlalchemy as sa
+
+from REST_APIs_mssql import FlaskApp
+
+
+def test_merge_batch_inserts_merges_consecutive_adds_with_same_columns():
+    operations = [
+        {'op': 'add', 'table_name': 'a', 'table_data': {'x': 1}},
+        {'op': 'add', 'table_name': 'a', 'table_data': [{'x': 2}, {'x': 3}]},
+    ]
+
+    groups = FlaskApp._merge_batch_inserts(operations)
+
+    assert len(groups) == 1
+    indices, operation, _ = groups[0]
+    assert indices == [0, 1]
+    assert operation['table_data'] == [{'x': 1}, {'x': 2}, {'x': 3}]
+
+
+def test_merge_batch_inserts_keeps_other_tables_columns_and_ops_apart():
+    operations = [
+        {'op': 'add', 'table_name': 'a', 'table_data': {'x': 1}},
+        {'op': 'add', 'table_name': 'a', 'table_data': {'y': 1}},
+        {'op': 'add', 'table_name': 'b', 'table_data': {'y': 2}},
+        {'op': 'delete', 'table_name': 'b', 'pk': 1},
+        {'op': 'add', 'table_name': 'b', 'table_data': {'y': 3}},
+    ]
+
+    groups = FlaskApp._merge_batch_inserts(operations)
+
+    assert [indices for indices, _, _ in groups] == [[0], [1], [2], [3], [4]]
+    assert groups[3][1] is operations[3]
+
+
+def test_merge_batch_inserts_does_not_merge_empty_table_data():
+    first = {'op': 'add', 'table_name': 'a', 'table_data': []}
+    operations = [
+        first,
+        {'op': 'add', 'table_name': 'a', 'table_data': {'x': 1}},
+        {'op': 'add', 'table_name': 'a', 'table_data': []},
+    ]
+
+    groups = FlaskApp._merge_batch_inserts(operations)
+
+    assert [indices for indices, _, _ in groups] == [[0], [1], [2]]
+    assert groups[0][1] is first
+    assert groups[2][1] is operations[2]
+
+
+def test_merge_batch_inserts_keeps_mixed_column_payload_unmerged():
+    operations = [
+        {'op': 'add', 'table_name': 'a', 'table_data': {'x': 1}},
+        {'op': 'add', 'table_name': 'a', 'table_data': [{'x': 2}, {'y': 3}]},
+    ]
+
+    groups = FlaskApp._merge_batch_inserts(operations)
+
+    assert [indices for indices, _, _ in groups] == [[0], [1]]
+    assert groups[1][1] is operations[1]
+
+
+def _sqlite_flask_app():
+    # read_data_from_mssql only needs db.engine and the table cache, so run it against SQLite
+    import threading
+
+    from flask import Flask
+
+    from REST_APIs_mssql import db
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        with db.engine.begin() as conn:
+            conn.execute(sa.text("CREATE TABLE items (id INTEGER PRIMARY KEY, price NUMERIC(10, 2), blob BLOB)"))
+            conn.execute(sa.text("INSERT INTO items VALUES (1, 1.50, X'0102'), (2, NULL, NULL)"))
+        metadata = sa.MetaData()
+        metadata.reflect(bind=db.engine)
+
+    flask_app = FlaskApp.__new__(FlaskApp)
+    flask_app.app = app
+    flask_app.metadata = metadata
+    flask_app._default_schema = 'main'
+    flask_app._table_lock = threading.Lock()
+    flask_app._table_cache = {}
+    return flask_app
+
+
+def test_read_data_from_mssql_streams_rows_as_json():
+    import orjson
+
+    flask_app = _sqlite_flask_app()
+
+    with flask_app.app.app_context():
+        body = b''.join(flask_app.read_data_from_mssql('main', 'items'))
+
+    assert orjson.loads(body) == [
+        {'id': 1, 'price': '1.50', 'blob': 'AQI='},
+        {'id': 2, 'price': None, 'blob': None},
+    ]
+
+
+class _Unserializable(sa.types.TypeDecorator):
+    impl = sa.Integer
+    cache_ok = True
+
+    def process_result_value(self, value, dialect):
+        return object()
+
+
+def test_read_data_from_mssql_reports_unserializable_first_row_before_streaming():
+    flask_app = _sqlite_flask_app()
+    flask_app._table_cache[('main', 'items')] = sa.Table('items', sa.MetaData(), sa.Column('id', _Unserializable))
+
+    with flask_app.app.app_context():
+        final_status = flask_app.read_data_from_mssql('main', 'items')
+
+    assert isinstance(final_status, dict)
+    assert "not JSON serializable" in final_status["error"]
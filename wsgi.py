@@ -0,0 +1,9 @@
+# Production entry point; the Werkzeug server in REST_APIs_mssql.run() is for local development only.
+#
+#   gunicorn -w $(nproc) -k gthread --threads 8 --keep-alive 30 wsgi:application
+#
+# Each worker imports this module, so the schema is reflected and the lookup caches are warm
+# before the worker accepts its first request.
+from REST_APIs_mssql import FlaskApp
+
+application = FlaskApp().app